@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import os
+import logging
 
 # Initialize FastAPI app
 app = FastAPI(title="Attribution Service", version="1.0.0")
@@ -40,7 +41,7 @@ try:
     from routes.royalties import router as royalties_router
     app.include_router(royalties_router)
 except Exception as _e:
-    print("royalties router not mounted:", _e)
+    logging.getLogger(__name__).warning("royalties router not mounted: %s", _e)
 
 if __name__ == "__main__":
     import uvicorn
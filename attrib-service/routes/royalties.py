@@ -4,6 +4,7 @@ from supabase import create_client
 import os, time
 from typing import Optional, List
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
@@ -11,6 +12,9 @@ sb = create_client(SUPABASE_URL, SUPABASE_KEY)
 
 router = APIRouter(prefix="", tags=["royalties"])
 
+# used to overlap independent supabase round-trips within one request
+_io_pool = ThreadPoolExecutor(max_workers=8)
+
 class SdkLogBody(BaseModel):
     model_id: str
     track_id: str
@@ -54,8 +58,14 @@ def _load_row(table: str, id_: str):
 
 @router.post("/fusion/verify")
 def fusion_verify(body: FusionBody):
-    partner = _load_row("partner_logs", body.partner_log_id) if body.partner_log_id else None
-    auditor = _load_row("auditor_matches", body.auditor_match_id) if body.auditor_match_id else None
+    if body.partner_log_id and body.auditor_match_id:
+        # both rows are independent so fetch them concurrently
+        partner_future = _io_pool.submit(_load_row, "partner_logs", body.partner_log_id)
+        auditor = _load_row("auditor_matches", body.auditor_match_id)
+        partner = partner_future.result()
+    else:
+        partner = _load_row("partner_logs", body.partner_log_id) if body.partner_log_id else None
+        auditor = _load_row("auditor_matches", body.auditor_match_id) if body.auditor_match_id else None
 
     # try to auto find counterpart if one side is missing but we have track
     if partner and not auditor:
@@ -64,16 +74,19 @@ def fusion_verify(body: FusionBody):
             .eq("track_id", partner["track_id"]) \
             .eq("model_id", partner["model_id"]) \
             .gte("detected_at", partner["started_at"]) \
+            .order("detected_at") \
+            .limit(1) \
             .execute()
         auditor = q.data[0] if q.data else None
     if auditor and not partner:
         # assume generate session near detected_at
-        start_after = auditor["detected_at"]
         q = sb.table("partner_logs") \
             .select("*") \
             .eq("track_id", auditor["track_id"]) \
             .eq("model_id", auditor.get("model_id")) \
             .lte("started_at", auditor["detected_at"]) \
+            .order("started_at", desc=True) \
+            .limit(1) \
             .execute()
         partner = q.data[0] if q.data else None
 
@@ -5,7 +5,9 @@ Minimal FastAPI attribution service for audio file comparison.
 import io
 import os
 import uuid
+import hashlib
 import traceback
+from collections import OrderedDict
 from typing import List, Dict, Any
 import numpy as np
 import librosa
@@ -56,79 +58,127 @@ REFERENCE_CATALOG = [
     {
         "trackTitle": "Echoes of You",
         "artist": "Josh Royal",
-        "fingerprint": np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0])
+        "fingerprint": np.array([0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0], dtype=np.float32)
     },
     {
         "trackTitle": "Midnight Lies", 
         "artist": "Ahna Mac",
-        "fingerprint": np.array([0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1])
+        "fingerprint": np.array([0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1], dtype=np.float32)
     },
     {
         "trackTitle": "Amber Skyline",
         "artist": "Essyonna", 
-        "fingerprint": np.array([0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2])
+        "fingerprint": np.array([0.3, 0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2], dtype=np.float32)
     },
     {
         "trackTitle": "Digital Dreams",
         "artist": "Neon Pulse",
-        "fingerprint": np.array([0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2, 0.3])
+        "fingerprint": np.array([0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2, 0.3], dtype=np.float32)
     },
     {
         "trackTitle": "Urban Symphony",
         "artist": "City Lights",
-        "fingerprint": np.array([0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2, 0.3, 0.4])
+        "fingerprint": np.array([0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2, 0.3, 0.4], dtype=np.float32)
     }
 ]
 
+# Catalog fingerprints stacked into one row-normalized matrix so an upload is
+# scored against every reference track with a single matrix-vector product
+CATALOG_MATRIX = np.stack([track["fingerprint"] for track in REFERENCE_CATALOG])
+CATALOG_MATRIX /= np.linalg.norm(CATALOG_MATRIX, axis=1, keepdims=True)
+
+TARGET_SAMPLE_RATE = 22050
+MAX_DURATION_SECONDS = 30
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024  # 10MB
+
+# STFT settings matching librosa.feature.mfcc defaults; the mel filterbank is
+# built once here instead of on every request
+N_MFCC = 10
+N_FFT = 2048
+HOP_LENGTH = 512
+MEL_BASIS = librosa.filters.mel(sr=TARGET_SAMPLE_RATE, n_fft=N_FFT)
+
+# Uploads quieter than this RMS (about -80 dBFS) are treated as silence
+SILENCE_RMS_THRESHOLD = 1e-4
+
 def extract_audio_fingerprint(audio_data: bytes) -> np.ndarray:
     """
     Extract a simple audio fingerprint using MFCC features.
+    
+    The fingerprint is mean-centered and scaled to unit length, so cosine
+    similarity against the pre-normalized catalog is a plain dot product.
+    Empty or near-silent audio yields an all-zero fingerprint without running
+    the STFT.
     """
+    # Load audio from bytes
     try:
-        # Load audio from bytes
-        audio, sr = librosa.load(io.BytesIO(audio_data), sr=22050, duration=30)
-        
-        # Extract MFCC features
-        mfccs = librosa.feature.mfcc(y=audio, sr=sr, n_mfcc=10)
-        
-        # Compute mean across time to get a single vector
-        fingerprint = np.mean(mfccs, axis=1)
-        
-        # Normalize the fingerprint
-        fingerprint = (fingerprint - np.mean(fingerprint)) / (np.std(fingerprint) + 1e-8)
-        
-        return fingerprint
+        audio, _ = librosa.load(io.BytesIO(audio_data), sr=TARGET_SAMPLE_RATE, duration=MAX_DURATION_SECONDS)
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error processing audio: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error decoding audio: {str(e)}")
+    
+    # Skip feature extraction for silent uploads
+    if audio.size == 0 or np.sqrt(np.vdot(audio, audio) / audio.size) < SILENCE_RMS_THRESHOLD:
+        return np.zeros(N_MFCC, dtype=np.float32)
+    
+    # Extract MFCC features
+    try:
+        power_spectrogram = np.abs(librosa.stft(audio, n_fft=N_FFT, hop_length=HOP_LENGTH)) ** 2
+        mel_spectrogram = MEL_BASIS @ power_spectrogram
+        mfccs = librosa.feature.mfcc(S=librosa.power_to_db(mel_spectrogram), n_mfcc=N_MFCC)
+    except librosa.util.exceptions.ParameterError as e:
+        raise HTTPException(status_code=400, detail=f"Error extracting audio features: {str(e)}")
+    
+    # Compute mean across time to get a single vector
+    fingerprint = mfccs.mean(axis=1)
+    
+    # Normalize the fingerprint in place
+    fingerprint -= fingerprint.mean()
+    fingerprint /= np.linalg.norm(fingerprint) + 1e-8
+    
+    return fingerprint
+
+# Fingerprints of recent uploads keyed by content hash, so re-submitting the
+# same audio (retries, re-audits) skips decoding and MFCC extraction
+FINGERPRINT_CACHE_SIZE = 256
+_fingerprint_cache: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
 
-def compute_similarity(fingerprint1: np.ndarray, fingerprint2: np.ndarray) -> float:
+def get_audio_fingerprint(audio_data: bytes) -> np.ndarray:
     """
-    Compute cosine similarity between two fingerprints.
+    Return the fingerprint for the audio bytes, reusing it for identical uploads.
     """
-    # Ensure both arrays have the same length
-    min_len = min(len(fingerprint1), len(fingerprint2))
-    fp1 = fingerprint1[:min_len]
-    fp2 = fingerprint2[:min_len]
-    
-    # Compute cosine similarity
-    dot_product = np.dot(fp1, fp2)
-    norm1 = np.linalg.norm(fp1)
-    norm2 = np.linalg.norm(fp2)
-    
-    if norm1 == 0 or norm2 == 0:
-        return 0.0
+    key = hashlib.blake2b(audio_data, digest_size=16).digest()
+    fingerprint = _fingerprint_cache.get(key)
+    if fingerprint is not None:
+        _fingerprint_cache.move_to_end(key)
+        return fingerprint
     
-    similarity = dot_product / (norm1 * norm2)
-    return max(0.0, min(1.0, similarity))  # Clamp between 0 and 1
+    fingerprint = extract_audio_fingerprint(audio_data)
+    fingerprint.setflags(write=False)  # Shared between requests
+    _fingerprint_cache[key] = fingerprint
+    if len(_fingerprint_cache) > FINGERPRINT_CACHE_SIZE:
+        _fingerprint_cache.popitem(last=False)
+    return fingerprint
+
+def compute_catalog_similarities(fingerprint: np.ndarray) -> np.ndarray:
+    """
+    Compute cosine similarity between a unit-length fingerprint (as returned
+    by extract_audio_fingerprint) and every catalog track.
+    """
+    # Pin float32 so a float64 caller doesn't upcast the GEMV
+    similarities = CATALOG_MATRIX @ np.asarray(fingerprint, dtype=np.float32)
+    return np.clip(similarities, 0.0, 1.0, out=similarities)  # Clamp between 0 and 1
 
 def normalize_influences(similarities: List[float]) -> List[float]:
     """
     Normalize similarities to sum to approximately 1.0.
     """
-    total = sum(similarities)
+    values = np.asarray(similarities, dtype=np.float32)
+    if values.size == 0:
+        return []
+    total = values.sum()
     if total == 0:
-        return [1.0 / len(similarities)] * len(similarities)
-    return [s / total for s in similarities]
+        return np.full(values.size, 1.0 / values.size, dtype=np.float32).tolist()
+    return (values / total).tolist()
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -168,9 +218,11 @@ async def compare_audio(file: UploadFile = File(...)):
         })
         raise HTTPException(status_code=400, detail="File must be an audio file")
     
-    # Check file size (10MB limit)
-    file_content = await file.read()
-    file_size = len(file_content)
+    # Check file size (10MB limit); read at most one byte past the limit so
+    # oversized uploads are rejected without pulling them into memory
+    file_content = await file.read(MAX_UPLOAD_BYTES + 1)
+    # Starlette records the full size while parsing the form
+    file_size = file.size if file.size is not None else len(file_content)
     
     # Update log with actual file size
     log_event("FILE_LOADED", {
@@ -179,7 +231,7 @@ async def compare_audio(file: UploadFile = File(...)):
         "file_size": file_size
     })
     
-    if file_size > 10 * 1024 * 1024:  # 10MB
+    if file_size > MAX_UPLOAD_BYTES:
         log_event("ERROR", {
             "trace_id": trace_id,
             "error": "file_too_large",
@@ -196,36 +248,32 @@ async def compare_audio(file: UploadFile = File(...)):
     
     try:
         # Extract fingerprint from uploaded file
-        uploaded_fingerprint = extract_audio_fingerprint(file_content)
+        uploaded_fingerprint = get_audio_fingerprint(file_content)
         
         # Compare against reference catalog
-        similarities = []
-        for track in REFERENCE_CATALOG:
-            similarity = compute_similarity(uploaded_fingerprint, track["fingerprint"])
-            similarities.append({
-                "track": track,
-                "similarity": similarity
-            })
-        
-        # Sort by similarity (descending)
-        similarities.sort(key=lambda x: x["similarity"], reverse=True)
+        similarities = compute_catalog_similarities(uploaded_fingerprint)
         
-        # Get top 3 matches
-        top_matches = similarities[:3]
+        # Get top 3 matches by similarity (descending, ties keep catalog order);
+        # a silent upload has an all-zero fingerprint and matches nothing
+        if uploaded_fingerprint.any():
+            top_indices = np.argsort(-similarities, kind="stable")[:3]
+        else:
+            top_indices = []
         
         # Extract similarities for normalization
-        sim_values = [match["similarity"] for match in top_matches]
+        sim_values = [float(similarities[i]) for i in top_indices]
         
         # Normalize to get percent influences
         influences = normalize_influences(sim_values)
         
         # Create response
         matches = []
-        for i, match in enumerate(top_matches):
+        for i, track_index in enumerate(top_indices):
+            track = REFERENCE_CATALOG[track_index]
             matches.append(Match(
-                trackTitle=match["track"]["trackTitle"],
-                artist=match["track"]["artist"],
-                similarity=round(match["similarity"], 3),
+                trackTitle=track["trackTitle"],
+                artist=track["artist"],
+                similarity=round(sim_values[i], 3),
                 percentInfluence=round(influences[i], 3)
             ))
         
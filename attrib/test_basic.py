@@ -23,6 +23,29 @@ try:
 except Exception as e:
     print(f"✗ FastAPI app creation failed: {e}")
 
+# Test fingerprint and catalog dtypes (needs requirements.txt and Supabase env)
+try:
+    import io
+    import numpy as np
+    import soundfile as sf
+    from main import REFERENCE_CATALOG, CATALOG_MATRIX, compute_catalog_similarities, extract_audio_fingerprint
+
+    assert all(track["fingerprint"].dtype == np.float32 for track in REFERENCE_CATALOG)
+    assert CATALOG_MATRIX.dtype == np.float32
+    assert compute_catalog_similarities(np.ones(CATALOG_MATRIX.shape[1])).dtype == np.float32
+
+    wav = io.BytesIO()
+    tone = 0.3 * np.sin(2 * np.pi * 440 * np.arange(22050) / 22050)
+    sf.write(wav, tone, 22050, format="WAV")
+    fingerprint = extract_audio_fingerprint(wav.getvalue())
+    assert fingerprint.dtype == np.float32
+    assert compute_catalog_similarities(fingerprint).dtype == np.float32
+    print("✓ Fingerprints and catalog are float32")
+except AssertionError:
+    print("✗ Fingerprint/catalog dtype is not float32")
+except Exception as e:
+    print(f"✗ Fingerprint dtype check skipped: {e}")
+
 print("\nTo install dependencies, run:")
 print("pip install -r requirements.txt")
 print("\nTo run the service, use:")
@@ -1,21 +1,75 @@
 from supabase import create_client
-import os, traceback
+import os, traceback, time, queue, threading, atexit, logging
 
 # Connect to Supabase using service key
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_SERVICE_KEY")
 supabase = create_client(SUPABASE_URL, SUPABASE_KEY)
 
+# Entries are buffered and written in bulk so request handlers never wait
+# on a Supabase round-trip
+FLUSH_INTERVAL_SECONDS = 0.25
+MAX_BATCH_SIZE = 500
+# Bound on buffered entries; if Supabase stalls, new entries are dropped
+# (and counted) instead of growing memory without limit
+MAX_PENDING_EVENTS = 10000
+
+_log = logging.getLogger(__name__)
+_pending = queue.Queue(maxsize=MAX_PENDING_EVENTS)
+_flush_lock = threading.Lock()
+_dropped_lock = threading.Lock()
+_dropped = 0
+
 def log_event(event_type: str, details: dict):
     """
-    Writes a structured log entry into the Supabase 'logs' table.
-    Think of this as a black box recorder: every major event
-    (upload, comparison, or error) gets written down here.
+    Queues a structured log entry for the Supabase 'logs' table.
+    Think of this as a black box recorder for every major event
+    (upload, comparison, or error), but writes are not synchronous:
+    the entry is buffered and inserted in batches by the log-flusher
+    thread (every FLUSH_INTERVAL_SECONDS) and once more at exit.
+    Delivery is best effort. If MAX_PENDING_EVENTS entries are already
+    waiting, the entry is dropped and only counted. A failed bulk
+    insert loses its whole batch, up to MAX_BATCH_SIZE entries.
     """
+    global _dropped
     try:
-        supabase.table("logs").insert({
+        _pending.put_nowait({
             "event_type": event_type,
             "details": details
-        }).execute()
-    except Exception as e:
-        print("❌ Log error:", e)
+        })
+    except queue.Full:
+        with _dropped_lock:
+            _dropped += 1
+
+def flush_events():
+    """
+    Writes all buffered log entries, up to MAX_BATCH_SIZE rows per insert.
+    """
+    global _dropped
+    with _dropped_lock:
+        dropped, _dropped = _dropped, 0
+    if dropped:
+        _log.warning("dropped %d log entries, buffer full", dropped)
+    
+    with _flush_lock:
+        while True:
+            rows = []
+            while len(rows) < MAX_BATCH_SIZE:
+                try:
+                    rows.append(_pending.get_nowait())
+                except queue.Empty:
+                    break
+            if not rows:
+                return
+            try:
+                supabase.table("logs").insert(rows).execute()
+            except Exception as e:
+                _log.warning("failed to write %d log entries: %s", len(rows), e)
+
+def _flush_loop():
+    while True:
+        time.sleep(FLUSH_INTERVAL_SECONDS)
+        flush_events()
+
+threading.Thread(target=_flush_loop, name="log-flusher", daemon=True).start()
+atexit.register(flush_events)
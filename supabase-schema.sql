@@ -159,6 +159,8 @@ CREATE INDEX IF NOT EXISTS idx_partner_logs_track_id ON partner_logs(track_id);
 CREATE INDEX IF NOT EXISTS idx_partner_logs_model_id ON partner_logs(model_id);
 CREATE INDEX IF NOT EXISTS idx_auditor_matches_track_id ON auditor_matches(track_id);
 CREATE INDEX IF NOT EXISTS idx_auditor_matches_model_id ON auditor_matches(model_id);
+CREATE INDEX IF NOT EXISTS idx_partner_logs_track_model_started ON partner_logs(track_id, model_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_auditor_matches_track_model_detected ON auditor_matches(track_id, model_id, detected_at);
 CREATE INDEX IF NOT EXISTS idx_royalty_events_track_id ON royalty_events(track_id);
 CREATE INDEX IF NOT EXISTS idx_royalty_events_status ON royalty_events(status);
 CREATE INDEX IF NOT EXISTS idx_royalty_claims_royalty_event_id ON royalty_claims(royalty_event_id);
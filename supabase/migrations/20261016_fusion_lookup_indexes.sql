@@ -0,0 +1,7 @@
+-- composite indexes for the fusion counterpart lookups in
+-- attrib-service/routes/royalties.py (fusion_verify), which filter on
+-- track_id + model_id and range-scan the event timestamp
+create index if not exists idx_auditor_matches_track_model_detected
+  on public.auditor_matches(track_id, model_id, detected_at);
+create index if not exists idx_partner_logs_track_model_started
+  on public.partner_logs(track_id, model_id, started_at);